@@ -47,6 +47,7 @@ class App:
         self._cardpool_index = 0
 
         self.bind_sidebar_buttons()
+        self.bind_card_buttons()
         QTimer.singleShot(0, self.cb_new_game_dialog)
 
     @property
@@ -78,16 +79,24 @@ class App:
         epidemic = self.view.epidemic_menu.button
         epidemic.clicked.connect(self.cb_epidemic)
 
+    def bind_card_buttons(self):
+        logging.info('Binding card buttons')
+        # Game decks are recreated on every new game, look them up by name
+        for name, view_deck in self.view.deck.items():
+            view_deck.button_clicked.connect(
+                lambda b, n=name: self.cb_draw_card(b, self.game.deck[n]))
+        self.view.pool_selector.button_clicked.connect(
+            self.cb_select_cardpool)
+
     def populate_draw(self):
         logging.info(f'Populating Draw Deck')
         self.view.deck['draw'].clear()
         deck = self.game.deck['draw']
         if not deck.is_empty():
             cards = deck.sorted()
-            for card in cards:
-                button = self.view.deck['draw'].add_card_button(card)
-                button.clicked.connect(
-                    lambda b=button, d=deck: self.cb_draw_card(b, d))
+            with self.view.deck['draw'].bulk_update() as view_deck:
+                for card in cards:
+                    view_deck.add_card_button(card)
 
     @staticmethod
     def is_last_card(deck):
@@ -136,10 +145,7 @@ class App:
 
     def add_button_to_deck(self, button, deck):
         logging.info(f'Adding button {button.card.name} to {deck.name}')
-        button = self.view.deck[deck.name].add_card_button(button.card)
-        if button is not None:
-            button.clicked.connect(
-                lambda b=button, d=deck: self.cb_draw_card(b, d))
+        self.view.deck[deck.name].add_card_button(button.card)
 
     def remove_button_from_deck(self, button, deck):
         logging.info(f'Removing button {button.card.name} from {deck.name}')
@@ -177,15 +183,10 @@ class App:
                 btn = self.view.pool_selector.button[i]
                 btn.setEnabled(True)
                 btn.set_text(text)
-                if not btn.is_connected():
-                    btn.clicked.connect(
-                        lambda index=i: self.cb_select_cardpool(index))
-                    btn.set_connected(True)
             else:
                 text = ''
                 btn = self.view.pool_selector.button[i]
                 btn.set_text(text)
-                btn.set_connected(False)
                 btn.setEnabled(False)
 
     def update_epidemic_menu(self):
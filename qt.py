@@ -1,10 +1,14 @@
 from PySide2.QtWidgets import QTextEdit, QWidget, QHBoxLayout, QVBoxLayout,\
     QLabel, QPushButton, QGroupBox, QRadioButton, QComboBox, QScrollArea,\
     QButtonGroup, QFrame
-from PySide2.QtCore import Qt, QSize, Signal
+from PySide2.QtCore import Qt, QEvent, QSize, Signal
+from PySide2.QtGui import QColor, QFont, QPainter, QPalette, QPixmap
+from collections import Counter
+from contextlib import contextmanager
 from enum import Enum
 import bisect
 import logging
+import sys
 
 
 ###############################################################################
@@ -20,6 +24,7 @@ WIDTH = 150                 # Width of buttons and layout columns
 HEIGHT = 24                 # Height of buttons
 WIDTH_WITH_SCROLL = 176
 TOP_CARDS = 16              # Number of Pool Selector buttons to display
+IS_MACOS = sys.platform == 'darwin'
 
 COLOR = {
     'blue': '#4073bf',
@@ -29,6 +34,7 @@ COLOR = {
     'green': '#009933',
     'gray': '#bfbfbf'
 }
+HOVER_COLOR = 'black'       # Card button background under the mouse
 
 
 class ButtonCSS(Enum):
@@ -39,15 +45,51 @@ class ButtonCSS(Enum):
     MouseEnter = 'background: black; color: white; font-weight: bold;'
 
 
+# Plain string copies of the ButtonCSS values. They are only parsed by Qt
+# as part of APP_QSS, once for the whole window.
+_ACTIVE_CSS = ButtonCSS.Active.value
+_INACTIVE_CSS = ButtonCSS.Inactive.value
+_HOVER_CSS = ButtonCSS.MouseEnter.value
+
+# Application stylesheet, installed once on the main window.
+# The log widgets are matched by object name, and Pool Selector buttons
+# switch between rules through their poolState property.
+# Card buttons are painted from pixmaps and need no stylesheet.
+APP_QSS = (
+    f'QFrame#log-frame {{'
+    f'border: 1px solid {COLOR["gray"]}; border-radius: 5px;}}'
+    f'QTextEdit#log-edit {{background-color: transparent;}}'
+    f'QLabel[poolState="active"] {{{_ACTIVE_CSS}}}'
+    f'QLabel[poolState="inactive"] {{{_INACTIVE_CSS}}}'
+    f'QLabel[poolState="hover"] {{{_HOVER_CSS}}}'
+)
+
+
 ###############################################################################
 # Various interface elements
 ###############################################################################
 
 
+_BOLD_FONT = None
+
+
+def bold_font():
+    """Return the bold font shared by headings and card buttons.
+    QFont needs a QApplication, so it's created on first use."""
+    global _BOLD_FONT
+    if _BOLD_FONT is None:
+        _BOLD_FONT = QFont()
+        _BOLD_FONT.setBold(True)
+    return _BOLD_FONT
+
+
 class Heading(QLabel):
     def __init__(self, text):
         super().__init__()
-        self.setText(f'<h4>{text}</h4>')
+        # Bold plain text renders like <h4> without a RichText parse
+        self.setTextFormat(Qt.PlainText)
+        self.setText(text)
+        self.setFont(bold_font())
         self.setAlignment(Qt.AlignHCenter)
 
 
@@ -102,32 +144,45 @@ class DestinationRadioBox(QGroupBox):
         self.setLayout(box)
 
 
+class RichTextLabel(QLabel):
+    """QLabel which skips setText when the HTML hasn't changed,
+    avoiding a full RichText layout on every game state update."""
+    def __init__(self):
+        super().__init__()
+        self.setTextFormat(Qt.RichText)
+        self._last_html = None
+
+    def set_html(self, html):
+        if html != self._last_html:
+            self._last_html = html
+            self.setText(html)
+
+
 class Stats(QVBoxLayout):
     def __init__(self):
         super().__init__()
         self.addWidget(Heading('Stats'))
-        self._text = QLabel()
-        self._text.setTextFormat(Qt.RichText)
+        self._text = RichTextLabel()
         self.addWidget(self._text)
         self._max_cards = 10
 
     def show(self, stats):
-        text = f'<p>Total cards in game: {stats.total}</p>'
-        text += f'<p>In discard pile: {stats.in_discard}</p>'
+        parts = [f'<p>Total cards in game: {stats.total}</p>',
+                 f'<p>In discard pile: {stats.in_discard}</p>']
         if stats.deck['draw'].is_empty():
-            text += '<p>(Draw Deck is empty)</p>'
+            parts.append('<p>(Draw Deck is empty)</p>')
         else:
-            text += f'<p><strong>Top probability:'
-            text += f'{stats.percentage:.2%}</strong></p>'
+            parts.append(f'<p><strong>Top probability:')
+            parts.append(f'{stats.percentage:.2%}</strong></p>')
             if len(stats.top_cards) < self._max_cards:
-                text += '<ul>'
+                parts.append('<ul>')
                 for card in stats.top_cards:
-                    text += f'<li>{card.name}</li>'
-                text += '</ul>'
+                    parts.append(f'<li>{card.name}</li>')
+                parts.append('</ul>')
             else:
-                text += f'<p>({self._max_cards}+ cards)</p>'
-            text += f'<p>({stats.top_freq} of each)</p>'
-        self._text.setText(text)
+                parts.append(f'<p>({self._max_cards}+ cards)</p>')
+            parts.append(f'<p>({stats.top_freq} of each)</p>')
+        self._text.set_html(''.join(parts))
 
 
 ###############################################################################
@@ -136,59 +191,69 @@ class Stats(QVBoxLayout):
 
 
 class PoolButton(QLabel):
-    clicked = Signal()
-
     def __init__(self):
         super().__init__()
         self.setAlignment(Qt.AlignCenter)
         self.active = None
+        self.setProperty('poolState', 'inactive')
         self.set_active(False)
-        self.connected = False
         self.setFixedSize(QSize(WIDTH, HEIGHT))
 
-    def set_connected(self, connected):
-        self.connected = connected
-
-    def is_connected(self):
-        return self.connected
-
     def set_active(self, active):
+        if active == self.active:
+            return
         self.active = active
-        self.setStyleSheet(
-            ButtonCSS.Active.value if active else ButtonCSS.Inactive.value)
-        self.repaint()  # Fix Qt bug on macOS
-
-    def mouseReleaseEvent(self, event):
-        self.clicked.emit()
-
-    def enterEvent(self, event):
-        if self.isEnabled():
-            self.setStyleSheet(ButtonCSS.MouseEnter.value)
-
-    def leaveEvent(self, event):
-        if self.isEnabled() and self.active:
-            self.setStyleSheet(ButtonCSS.Active.value)
+        self.set_state('active' if active else 'inactive')
+
+    def set_state(self, state):
+        # Restyle from the parent stylesheet without reparsing any CSS
+        self.setProperty('poolState', state)
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
+
+    def set_hover(self, hover):
+        if hover and self.isEnabled():
+            self.set_state('hover')
+        elif self.isEnabled() and self.active:
+            self.set_state('active')
         else:
-            self.setStyleSheet(ButtonCSS.Inactive.value)
+            self.set_state('inactive')
 
     def set_text(self, text):
         self.setText(text)
-        self.repaint()  # Fix Qt bug on macOS
+        if IS_MACOS:
+            self.repaint()  # Fix Qt bug on macOS
 
 
 class PoolSelector(QVBoxLayout):
+    """Column of Pool Selector buttons. Mouse events from all the buttons
+    go through a single event filter, which emits button_clicked
+    with the index of the clicked button."""
+    button_clicked = Signal(int)
+
     def __init__(self, count):
         super().__init__()
+        self.setSpacing(SPACING)
         self.addWidget(Heading('INFECTION DECK'))
-        v_buttons = QVBoxLayout()
-        v_buttons.setSpacing(SPACING)
-        self.addLayout(v_buttons)
         self.button = []
         for i in range(count):
             btn = PoolButton()
             btn.set_active(False)
+            btn.installEventFilter(self)
             self.button.append(btn)
-            v_buttons.addWidget(btn)
+            self.addWidget(btn)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.MouseButtonRelease:
+            # Filters run before Qt discards events for disabled widgets
+            if obj.isEnabled():
+                self.button_clicked.emit(self.button.index(obj))
+        elif event.type() == QEvent.Enter:
+            obj.set_hover(True)
+        elif event.type() == QEvent.Leave:
+            obj.set_hover(False)
+        return False
 
 
 class Log(QFrame):
@@ -197,22 +262,35 @@ class Log(QFrame):
         # QFrame needs an object name so that its stylesheet border
         # isn't applied to the QTextEdit child widget
         self.setObjectName('log-frame')
-        style = f'border: 1px solid {COLOR["gray"]}; border-radius: 5px;'
-        self.setStyleSheet('QFrame#log-frame {' + style + '}')
         layout = QVBoxLayout()
         self.setLayout(layout)
 
-        # CSS selector set specifically to QTextEdit
+        # CSS selector set specifically to the QTextEdit by object name
         # otherwise scrollbar appearance is modified
         self.edit = QTextEdit()
-        self.edit.setStyleSheet('QTextEdit {background-color: transparent}')
+        self.edit.setObjectName('log-edit')
         self.edit.setReadOnly(True)
         layout.addWidget(self.edit)
 
+        # Entries logged while hidden, appended when the log is shown
+        self._pending = []
+
     def log(self, text):
-        self.edit.append(text)
+        if not text:
+            return
+        if self.edit.isVisible():
+            self.edit.append(text)
+        else:
+            self._pending.append(text)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._pending:
+            self.edit.append('<br>'.join(self._pending))
+            self._pending.clear()
 
     def clear(self):
+        self._pending.clear()
         self.edit.clear()
 
 
@@ -220,8 +298,7 @@ class Cardpool(QVBoxLayout):
     def __init__(self):
         super().__init__()
         self.addWidget(Heading(''))
-        self._text = QLabel()
-        self._text.setTextFormat(Qt.RichText)
+        self._text = RichTextLabel()
         self._text.setWordWrap(True)
         self._text.setFixedWidth(WIDTH)
         self.addWidget(self._text)
@@ -229,18 +306,21 @@ class Cardpool(QVBoxLayout):
         self._max_cards = 35
 
     def show_empty(self):
-        self._text.setText(f'<p>Draw Deck is empty.</p>')
+        self._text.set_html(f'<p>Draw Deck is empty.</p>')
 
     def show(self, deck_name, position, deck):
-        text = f'<p>Card position: {position}</p>'
-        text += f'<p>(from {deck_name})<p>'
-        text += f'<p><strong>Possible cards:</strong></p>'
+        parts = [f'<p>Card position: {position}</p>',
+                 f'<p>(from {deck_name})<p>',
+                 f'<p><strong>Possible cards:</strong></p>']
         if len(deck) < self._max_cards:
-            for card in sorted(set(deck.cards), key=lambda x: x.name):
-                text += f'{card.name} ({deck.cards.count(card)})<br>'
+            # Sort (name, count) tuples natively, without a key callback
+            counts = sorted((card.name, n)
+                            for card, n in Counter(deck.cards).items())
+            for name, n in counts:
+                parts.append(f'{name} ({n})<br>')
         else:
-            text += f'{self._max_cards}+ cards'
-        self._text.setText(text)
+            parts.append(f'{self._max_cards}+ cards')
+        self._text.set_html(''.join(parts))
 
 
 ###############################################################################
@@ -248,79 +328,148 @@ class Cardpool(QVBoxLayout):
 ###############################################################################
 
 
-class CardButton(QLabel):
-    clicked = Signal()
+_COLOR_PIXMAPS = {}
 
+
+def color_pixmap(color):
+    """Return a button-sized pixmap filled with color.
+    Each color is only rendered once. QPixmap needs a QApplication,
+    so pixmaps are created on first use rather than at import."""
+    pixmap = _COLOR_PIXMAPS.get(color)
+    if pixmap is None:
+        pixmap = QPixmap(WIDTH, HEIGHT)
+        pixmap.fill(QColor(color))
+        _COLOR_PIXMAPS[color] = pixmap
+    return pixmap
+
+
+class CardButton(QLabel):
+    """Card label painted over a shared color pixmap,
+    which keeps the stylesheet engine out of the paint path."""
     def __init__(self, card):
         super().__init__(card.name)
         self.card = card
         self.color = None
-        self.stylesheet = None
+        self.background = None
+        self.hover = False
         self.setAlignment(Qt.AlignCenter)
         self.setFixedSize(QSize(WIDTH, HEIGHT))
+        self.setFont(bold_font())
+        palette = self.palette()
+        palette.setColor(QPalette.WindowText, Qt.white)
+        self.setPalette(palette)
 
     def set_color(self, color):
+        if color == self.color:
+            return
         self.color = color
-        self.stylesheet = f'background: {self.color};' \
-                          f'color: white;' \
-                          f'font-weight: bold;'
-        self.setStyleSheet(self.stylesheet)
-
-    def mouseReleaseEvent(self, event):
-        self.clicked.emit()
+        self.background = color_pixmap(color)
+        self.update()
 
-    def enterEvent(self, event):
-        self.setStyleSheet(ButtonCSS.MouseEnter.value)
+    def set_hover(self, hover):
+        self.hover = hover
+        self.update()
 
-    def leaveEvent(self, event):
-        self.setStyleSheet(self.stylesheet)
+    def paintEvent(self, event):
+        pixmap = color_pixmap(HOVER_COLOR) if self.hover else self.background
+        if pixmap is not None:
+            painter = QPainter(self)
+            painter.drawPixmap(0, 0, pixmap)
+            painter.end()
+        super().paintEvent(event)
 
 
 class Deck(QVBoxLayout):
+    """Scrollable column of card buttons. Mouse events from all the buttons
+    go through a single event filter, which emits button_clicked
+    with the clicked button."""
+    button_clicked = Signal(object)
+
     def __init__(self, heading, color=True):
         super().__init__()
-        logging.info(f'[Deck] {heading} init')
+        logging.info('[Deck] %s init', heading)
         self.addWidget(Heading(heading))
         self.use_color = color
         self.cards = []
-        self.buttons = []
+        self.buttons = {}  # Ordered set of buttons, values unused
         self.heading = heading
 
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setFixedWidth(WIDTH_WITH_SCROLL)
         self.addWidget(self.scroll_area)
+        self.set_scroll_widget()
 
+    def set_scroll_widget(self):
+        # Install an empty widget holding the card buttons in the scroll area
         self.v_scroll = QVBoxLayout()
         self.v_scroll.setSpacing(SPACING)
-        self.v_scroll.addStretch()
+        self.v_scroll.setAlignment(Qt.AlignTop)
 
         self.scroll_widget = QWidget()
         self.scroll_widget.setLayout(self.v_scroll)
-        self.scroll_area.setFixedWidth(WIDTH_WITH_SCROLL)
         self.scroll_area.setWidget(self.scroll_widget)
 
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.MouseButtonRelease:
+            # Filters run before Qt discards events for disabled widgets
+            if obj.isEnabled():
+                self.button_clicked.emit(obj)
+        elif event.type() == QEvent.Enter:
+            obj.set_hover(True)
+        elif event.type() == QEvent.Leave:
+            obj.set_hover(False)
+        return False
+
+    def begin_bulk(self):
+        self.scroll_widget.setUpdatesEnabled(False)
+
+    def end_bulk(self):
+        self.scroll_widget.setUpdatesEnabled(True)
+
+    @contextmanager
+    def bulk_update(self):
+        """Coalesce repaints while adding many card buttons at once."""
+        self.begin_bulk()
+        try:
+            yield self
+        finally:
+            self.end_bulk()
+
     def add_card_button(self, card):
         return self.insert_button_at_index(card, 0)
 
     def insert_button_at_index(self, card, index):
+        """Insert a button for card at index in the deck column.
+        Cards may carry a precomputed hex_color attribute,
+        otherwise their color name is looked up in COLOR."""
         button = CardButton(card)
+        button.installEventFilter(self)
         self.v_scroll.insertWidget(index, button)
-        color = COLOR[card.color] if self.use_color else COLOR['gray']
+        if self.use_color:
+            color = getattr(card, 'hex_color', None) or COLOR[card.color]
+        else:
+            color = COLOR['gray']
         button.set_color(color)
         self.cards.insert(index, card.name)
-        self.buttons.append(button)
+        self.buttons[button] = None
         return button
 
     def remove_card_button(self, button):
         self.cards.remove(button.card.name)
-        self.buttons.remove(button)
+        self.delete_button(button)
+
+    def delete_button(self, button):
+        del self.buttons[button]
         self.removeWidget(button)
         button.deleteLater()
 
     def clear(self):
-        logging.info(f'[Deck] clear {self.heading}')
-        for button in self.buttons:
-            button.deleteLater()
+        logging.info('[Deck] clear %s', self.heading)
+        # Delete all the buttons at once with their parent widget
+        old = self.scroll_area.takeWidget()
+        old.deleteLater()
+        self.set_scroll_widget()
         self.cards.clear()
         self.buttons.clear()
 
@@ -328,17 +477,35 @@ class Deck(QVBoxLayout):
 class DrawDeck(Deck):
     def __init__(self, heading):
         super().__init__(heading)
+        # Card names are unique in the Draw Deck,
+        # the set gives a fast membership test for self.cards
+        self._card_name_set = set()
 
     def add_card_button(self, card):
         # Override base method, use bisect to insert
         # the card into the Draw Deck in sorted order
-        if card.name not in self.cards:
+        if card.name not in self._card_name_set:
             index = bisect.bisect_left(self.cards, card.name)
+            self._card_name_set.add(card.name)
             return super().insert_button_at_index(card, index)
         else:
             print(f'[qt DrawCardDeck] {card.name} already in layout')
             return None
 
+    def remove_card_button(self, button):
+        # Override base method, card names are unique and sorted
+        # so the name can be found with bisect
+        name = button.card.name
+        index = bisect.bisect_left(self.cards, name)
+        if index < len(self.cards) and self.cards[index] == name:
+            self.cards.pop(index)
+            self._card_name_set.discard(name)
+        self.delete_button(button)
+
+    def clear(self):
+        super().clear()
+        self._card_name_set.clear()
+
 
 ###############################################################################
 # Main window
@@ -347,7 +514,8 @@ class DrawDeck(Deck):
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
-        logging.info(f'[MainWindow] init')
+        logging.info('[MainWindow] init')
+        self.setStyleSheet(APP_QSS)
 
         self.top_cards = TOP_CARDS
         self.cardpool = Cardpool()
@@ -421,7 +589,7 @@ class MainWindow(QWidget):
         h_main.addStretch()
 
     def initialise(self):
-        logging.info(f'[Main Window] initialise')
+        logging.info('[Main Window] initialise')
         self.destination['exclude_deck'].setChecked(True)
         for k, v in self.deck.items():
             self.deck[k].clear()
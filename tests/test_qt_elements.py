@@ -1,8 +1,11 @@
 from unittest.case import TestCase
 import unittest
 import qt
+from decks import Card
 from PySide2.QtWidgets import QApplication
 from PySide2.QtWidgets import QRadioButton, QPushButton, QComboBox, QWidget
+from PySide2.QtCore import Qt, QEvent
+from PySide2.QtTest import QTest
 
 
 @classmethod
@@ -55,6 +58,130 @@ class TestQtElements(TestCase):
     def test_creation_of_stats_section(self):
         pass
 
+    def test_rich_text_label_skips_unchanged_html(self):
+        label = qt.RichTextLabel()
+        label.set_html('<p>One</p>')
+        self.assertEqual(label.text(), '<p>One</p>')
+        label.setText('changed elsewhere')
+        label.set_html('<p>One</p>')
+        self.assertEqual(label.text(), 'changed elsewhere')
+        label.set_html('<p>Two</p>')
+        self.assertEqual(label.text(), '<p>Two</p>')
+
+    def test_draw_deck_ignores_duplicate_cards(self):
+        deck = qt.DrawDeck('DRAW')
+        self.main.setLayout(deck)
+        paris = Card('Paris', 'blue')
+        self.assertIsNotNone(deck.add_card_button(paris))
+        self.assertIsNone(deck.add_card_button(paris))
+        self.assertIsNotNone(deck.add_card_button(Card('Lima', 'yellow')))
+        self.assertEqual(deck.cards, ['Lima', 'Paris'])
+
+    def test_draw_deck_remove_card_button(self):
+        deck = qt.DrawDeck('DRAW')
+        self.main.setLayout(deck)
+        buttons = [deck.add_card_button(Card(name, 'blue'))
+                   for name in ('Paris', 'Lima', 'Essen')]
+        deck.remove_card_button(buttons[1])
+        self.assertEqual(deck.cards, ['Essen', 'Paris'])
+        self.assertEqual(len(deck.buttons), 2)
+        self.assertIsNotNone(deck.add_card_button(Card('Lima', 'yellow')))
+
+    def test_deck_clear(self):
+        deck = qt.Deck('DISCARD')
+        self.main.setLayout(deck)
+        deck.add_card_button(Card('Paris', 'blue'))
+        deck.add_card_button(Card('Paris', 'blue'))
+        old_widget = deck.scroll_widget
+        deck.clear()
+        self.assertEqual(deck.cards, [])
+        self.assertEqual(len(deck.buttons), 0)
+        self.assertIsNot(deck.scroll_widget, old_widget)
+        self.assertIs(deck.scroll_area.widget(), deck.scroll_widget)
+        self.assertEqual(deck.v_scroll.count(), 0)
+
+    def test_deck_bulk_update(self):
+        deck = qt.Deck('DISCARD')
+        self.main.setLayout(deck)
+        with deck.bulk_update():
+            self.assertFalse(deck.scroll_widget.updatesEnabled())
+            deck.add_card_button(Card('Paris', 'blue'))
+        self.assertTrue(deck.scroll_widget.updatesEnabled())
+        self.assertEqual(deck.cards, ['Paris'])
+
+    def test_card_button_color_pixmaps_are_shared(self):
+        deck = qt.Deck('DISCARD')
+        self.main.setLayout(deck)
+        paris = deck.add_card_button(Card('Paris', 'blue'))
+        essen = deck.add_card_button(Card('Essen', 'blue'))
+        self.assertIs(paris.background, essen.background)
+        self.assertEqual(paris.styleSheet(), '')
+
+    def test_log_buffers_entries_while_hidden(self):
+        log = qt.Log()
+        log.log('First')
+        log.log('')
+        log.log('Second')
+        log.log('Third')
+        self.assertEqual(log.edit.toPlainText(), '')
+        log.show()
+        self.assertEqual(log.edit.toPlainText(), 'First\nSecond\nThird')
+        log.log('Fourth')
+        self.assertTrue(log.edit.toPlainText().endswith('Third\nFourth'))
+        log.hide()
+
+    def test_main_window_is_the_only_styled_widget(self):
+        window = qt.MainWindow()
+        window.deck['draw'].add_card_button(Card('Paris', 'blue'))
+        self.assertEqual(window.styleSheet(), qt.APP_QSS)
+        for widget in window.findChildren(QWidget):
+            self.assertEqual(widget.styleSheet(), '')
+
+    def test_pool_button_state(self):
+        selector = qt.PoolSelector(2)
+        self.main.setLayout(selector)
+        button = selector.button[0]
+        self.assertEqual(button.property('poolState'), 'inactive')
+
+        button.set_active(True)
+        self.assertEqual(button.property('poolState'), 'active')
+
+        button.set_state('inactive')
+        button.set_active(True)  # Unchanged, no restyle
+        self.assertEqual(button.property('poolState'), 'inactive')
+        button.set_state('active')
+
+        QApplication.sendEvent(button, QEvent(QEvent.Enter))
+        self.assertEqual(button.property('poolState'), 'hover')
+        QApplication.sendEvent(button, QEvent(QEvent.Leave))
+        self.assertEqual(button.property('poolState'), 'active')
+
+    def test_pool_selector_click(self):
+        selector = qt.PoolSelector(3)
+        self.main.setLayout(selector)
+        clicked = []
+        selector.button_clicked.connect(clicked.append)
+        QTest.mouseClick(selector.button[2], Qt.LeftButton)
+        self.assertEqual(clicked, [2])
+
+    def test_disabled_pool_button_click_is_ignored(self):
+        selector = qt.PoolSelector(3)
+        self.main.setLayout(selector)
+        clicked = []
+        selector.button_clicked.connect(clicked.append)
+        selector.button[2].setEnabled(False)
+        QTest.mouseClick(selector.button[2], Qt.LeftButton)
+        self.assertEqual(clicked, [])
+
+    def test_deck_click(self):
+        deck = qt.Deck('DISCARD')
+        self.main.setLayout(deck)
+        button = deck.add_card_button(Card('Paris', 'blue'))
+        clicked = []
+        deck.button_clicked.connect(clicked.append)
+        QTest.mouseClick(button, Qt.LeftButton)
+        self.assertEqual(clicked, [button])
+
 
 if __name__ == '__main__':
     unittest.main()